@@ -0,0 +1,496 @@
+import os
+import sys
+import csv
+import json
+import argparse
+import warnings
+from datetime import datetime, timezone
+from itertools import islice
+from collections import Counter
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from co2_bands import CO2_EXCELLENT_MAX, CO2_GOOD_MAX, CO2_BANDS
+
+# Usage: python analyze.py sensor_data.csv [more.csv ...] [--json]
+#
+# Logs are streamed in fixed-size chunks and per-minute/per-hour aggregates
+# are written to CSV as soon as each period closes, so memory stays bounded
+# by --chunk-size no matter how large the file is. Files without a Timestamp
+# column are assumed to be sampled every --interval seconds (the simulator
+# emits one reading per second), so every non-blank line counts as one sample.
+
+CHANNELS = ["Temperature", "Humidity", "CO2"]
+TIMESTAMP_COLUMN = "Timestamp"
+
+PERIODS = {'minute': 60, 'hour': 3600}
+MAX_LISTED_GAPS = 10
+
+
+def co2_band(co2):
+    # 0 = Excellent (< 800), 1 = Good (< 1200), 2 = Poor
+    return np.searchsorted([CO2_EXCELLENT_MAX, CO2_GOOD_MAX], co2, side='right')
+
+
+def parse_value(text):
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+
+def parse_timestamp(text):
+    # Epoch seconds or ISO 8601 ("2025-01-01T00:00:00", naive times are UTC)
+    text = text.strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    try:
+        moment = datetime.fromisoformat(text[:-1] + '+00:00' if text.endswith('Z') else text)
+    except ValueError:
+        return np.nan
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def parse_lines(lines, columns, parsers):
+    # Slow path for chunks with short, blank or non-numeric lines: fully blank
+    # lines are skipped, missing or malformed fields become NaN
+    rows = []
+    for line in lines:
+        if not line.strip():
+            continue
+        fields = line.rstrip('\r\n').split(',')
+        rows.append([parse(fields[column]) if column < len(fields) else np.nan
+                     for column, parse in zip(columns, parsers)])
+    return np.array(rows, dtype=float).reshape(len(rows), len(columns))
+
+
+def read_chunks(path, chunk_size=100000):
+    with open(path, 'r', newline='', encoding='utf-8-sig') as file:
+        header = [name.strip() for name in next(csv.reader([file.readline()]))]
+        missing = [name for name in CHANNELS if name not in header]
+        if missing:
+            raise ValueError(f"{path}: missing columns {', '.join(missing)}")
+
+        columns = [header.index(name) for name in CHANNELS]
+        parsers = [parse_value] * len(CHANNELS)
+        timestamped = TIMESTAMP_COLUMN in header
+        if timestamped:
+            columns.append(header.index(TIMESTAMP_COLUMN))
+            parsers.append(parse_timestamp)
+        converters = None
+        has_time = False
+
+        while True:
+            lines = list(islice(file, chunk_size))
+            if not lines:
+                break
+            if timestamped and converters is None:
+                # Numeric timestamps stay on loadtxt's C parser; others need a converter
+                first = next((line for line in lines if line.strip()), None)
+                if first is not None:
+                    fields = first.rstrip('\r\n').split(',')
+                    sample = fields[columns[3]] if columns[3] < len(fields) else ''
+                    converters = {} if not np.isnan(parse_value(sample)) else {columns[3]: parse_timestamp}
+
+            try:
+                with warnings.catch_warnings():
+                    # A chunk of only empty lines is not worth a warning
+                    warnings.simplefilter('ignore', UserWarning)
+                    data = np.loadtxt(lines, delimiter=',', dtype=float, usecols=columns,
+                                      comments=None, converters=converters or None, ndmin=2)
+            except ValueError:
+                data = parse_lines(lines, columns, parsers)
+            if not len(data):
+                continue
+            if timestamped:
+                has_time = has_time or not np.isnan(data[:, 3]).all()
+            yield data[:, :3], (data[:, 3] if timestamped else None)
+
+        if timestamped and not has_time:
+            raise ValueError(f"{path}: no readable values in {TIMESTAMP_COLUMN} column "
+                             "(expected epoch seconds or ISO 8601)")
+
+
+class LogAnalyzer:
+    def __init__(self, interval=1.0, gap_factor=1.5, periods=('minute', 'hour'), on_bucket=None):
+        self.interval = interval
+        self.gap_threshold = interval * gap_factor
+        self.periods = periods
+        self.on_bucket = on_bucket  # Called with (period, row) when a period closes
+        self.rows = 0
+        self.timestamped = False
+        self.out_of_order = 0
+        self.latest_time = -np.inf
+
+        # Per-channel running statistics (merged chunk by chunk)
+        self.count = np.zeros(3)
+        self.mean = np.zeros(3)
+        self.m2 = np.zeros(3)
+        self.min = np.full(3, np.inf)
+        self.max = np.full(3, -np.inf)
+        self.missing = np.zeros(3, dtype=int)
+
+        # Open resampling bucket per period: (key, [count, sum, min, max] per channel)
+        self.buckets = {period: None for period in periods}
+        self.bucket_counts = {period: 0 for period in periods}
+
+        # CO2 band durations and continuous episodes
+        self.band_seconds = np.zeros(len(CO2_BANDS))
+        self.band_episodes = np.zeros(len(CO2_BANDS), dtype=int)
+        self.band_longest = np.zeros(len(CO2_BANDS))
+        self.run = None  # [band, duration] of the episode still in progress
+        self.run_broken = False
+
+        # Last complete reading, carried across chunk boundaries
+        self.last_time = None
+        self.last_band = None
+        self.gap_count = 0
+        self.gap_seconds = 0.0
+        self.longest_gap = 0.0
+        self.gaps = []  # Only the first MAX_LISTED_GAPS are kept
+
+    def update(self, values, times=None):
+        n = len(values)
+        if times is None:
+            times = (self.rows + np.arange(n)) * self.interval
+        else:
+            self.timestamped = True
+            # Readings older than one already seen cannot be placed in closed
+            # periods or episodes, so they are dropped and counted instead
+            seen = np.maximum.accumulate(np.concatenate(([self.latest_time], np.fmax(times, -np.inf))))
+            ordered = np.isnan(times) | (times >= seen[:-1])
+            self.latest_time = seen[-1]
+            self.out_of_order += int(n - ordered.sum())
+            values, times = values[ordered], times[ordered]
+        self.rows += n
+        if not len(values):
+            return
+
+        valid = ~np.isnan(values)
+        self.missing += len(values) - valid.sum(axis=0)
+        self.update_stats(values, valid)
+
+        has_time = ~np.isnan(times)
+        for period in self.periods:
+            self.update_buckets(period, values[has_time], valid[has_time], times[has_time])
+
+        complete = valid.all(axis=1) & has_time
+        self.update_timeline(times[complete], co2_band(values[complete, 2]))
+
+    def update_stats(self, values, valid):
+        count = valid.sum(axis=0)
+        filled = np.where(valid, values, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = filled.sum(axis=0) / count
+            m2 = (np.where(valid, values - mean, 0.0) ** 2).sum(axis=0)
+            total = self.count + count
+            delta = mean - self.mean
+            merged_mean = self.mean + delta * count / total
+            merged_m2 = self.m2 + m2 + delta ** 2 * self.count * count / total
+
+        has_data = count > 0
+        self.mean = np.where(has_data, merged_mean, self.mean)
+        self.m2 = np.where(has_data, merged_m2, self.m2)
+        self.count = total
+        self.min = np.fmin(self.min, np.where(valid, values, np.inf).min(axis=0))
+        self.max = np.fmax(self.max, np.where(valid, values, -np.inf).max(axis=0))
+
+    def update_buckets(self, period, values, valid, times):
+        if not len(times):
+            return
+        # Times are ordered, so each bucket is a contiguous slice of the chunk
+        all_keys = np.floor(times / PERIODS[period]).astype(np.int64)
+        starts = np.flatnonzero(np.concatenate(([True], all_keys[1:] != all_keys[:-1])))
+        keys = all_keys[starts]
+        count = np.add.reduceat(valid.astype(float), starts)
+        total = np.add.reduceat(np.where(valid, values, 0.0), starts)
+        low = np.minimum.reduceat(np.where(valid, values, np.inf), starts)
+        high = np.maximum.reduceat(np.where(valid, values, -np.inf), starts)
+
+        # Times only move forward, so a new key means the open bucket is complete
+        for i, key in enumerate(keys):
+            current = self.buckets[period]
+            if current is not None and current[0] == key:
+                acc = current[1]
+                acc[0] += count[i]
+                acc[1] += total[i]
+                acc[2] = np.minimum(acc[2], low[i])
+                acc[3] = np.maximum(acc[3], high[i])
+            else:
+                self.close_bucket(period)
+                self.buckets[period] = (key, np.stack([count[i], total[i], low[i], high[i]]))
+
+    def close_bucket(self, period):
+        current = self.buckets[period]
+        if current is None:
+            return
+        key, (count, total, low, high) = current
+        row = {'start': float(key * PERIODS[period])}
+        for i, name in enumerate(CHANNELS):
+            has_data = count[i] > 0
+            row[name] = {
+                'count': int(count[i]),
+                'mean': float(total[i] / count[i]) if has_data else None,
+                'min': float(low[i]) if has_data else None,
+                'max': float(high[i]) if has_data else None,
+            }
+        self.bucket_counts[period] += 1
+        self.buckets[period] = None
+        if self.on_bucket:
+            self.on_bucket(period, row)
+
+    def update_timeline(self, times, bands):
+        if not len(times):
+            return
+        if self.last_time is not None:
+            times = np.concatenate(([self.last_time], times))
+            bands = np.concatenate(([self.last_band], bands))
+
+        # Each reading holds until the next one, unless a gap separates them
+        step = np.diff(times)
+        gap = step > self.gap_threshold
+        if gap.any():
+            lengths = step[gap]
+            self.gap_count += len(lengths)
+            self.gap_seconds += float(lengths.sum())
+            self.longest_gap = max(self.longest_gap, float(lengths.max()))
+            room = MAX_LISTED_GAPS - len(self.gaps)
+            for start, end in zip(times[:-1][gap][:room], times[1:][gap][:room]):
+                self.gaps.append((float(start), float(end)))
+        self.add_durations(bands[:-1], np.where(gap, self.interval, step), gap)
+
+        self.last_time = times[-1]
+        self.last_band = bands[-1]
+
+    def add_durations(self, bands, durations, breaks):
+        if not len(bands):
+            return
+        self.band_seconds += np.bincount(bands, weights=durations, minlength=len(CO2_BANDS))
+
+        new_run = np.empty(len(bands), dtype=bool)
+        new_run[0] = self.run is None or self.run_broken or self.run[0] != bands[0]
+        new_run[1:] = (bands[1:] != bands[:-1]) | breaks[:-1]
+        starts = np.flatnonzero(new_run)
+
+        if not new_run[0]:
+            self.run[1] += durations[:(starts[0] if len(starts) else None)].sum()
+        if len(starts):
+            self.close_run()
+            run_bands = bands[starts]
+            run_durations = np.add.reduceat(durations, starts)
+            # Every run but the last is complete; the last one may continue in the next chunk
+            done_bands, done_durations = run_bands[:-1], run_durations[:-1]
+            self.band_episodes += np.bincount(done_bands, minlength=len(CO2_BANDS))
+            for band in range(len(CO2_BANDS)):
+                longest = done_durations[done_bands == band]
+                if len(longest):
+                    self.band_longest[band] = max(self.band_longest[band], longest.max())
+            self.run = [run_bands[-1], run_durations[-1]]
+        self.run_broken = bool(breaks[-1])
+
+    def close_run(self):
+        if self.run is None:
+            return
+        band, duration = self.run
+        self.band_episodes[band] += 1
+        self.band_longest[band] = max(self.band_longest[band], duration)
+        self.run = None
+
+    def finish(self):
+        # The final reading is counted for one nominal interval
+        if self.last_time is not None:
+            self.add_durations(np.array([self.last_band]), np.array([self.interval]),
+                               np.array([True]))
+            self.last_time = None
+        self.close_run()
+        for period in self.periods:
+            self.close_bucket(period)
+
+    def result(self):
+        self.finish()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(self.m2 / (self.count - 1))
+
+        summary = {}
+        for i, name in enumerate(CHANNELS):
+            has_data = self.count[i] > 0
+            summary[name] = {
+                'count': int(self.count[i]),
+                'missing': int(self.missing[i]),
+                'mean': float(self.mean[i]) if has_data else None,
+                'std': float(std[i]) if self.count[i] > 1 else None,
+                'min': float(self.min[i]) if has_data else None,
+                'max': float(self.max[i]) if has_data else None,
+            }
+
+        bands = {}
+        for i, name in enumerate(CO2_BANDS):
+            bands[name] = {
+                'seconds': float(self.band_seconds[i]),
+                'episodes': int(self.band_episodes[i]),
+                'longest_seconds': float(self.band_longest[i]),
+            }
+
+        return {
+            'rows': self.rows,
+            'timestamped': self.timestamped,
+            'out_of_order': self.out_of_order,
+            'summary': summary,
+            'co2_bands': bands,
+            'gaps': {
+                'count': self.gap_count,
+                'seconds': self.gap_seconds,
+                'longest_seconds': self.longest_gap,
+                'first': [{'start': start, 'end': end, 'seconds': end - start} for start, end in self.gaps],
+            },
+            'resampled': dict(self.bucket_counts),
+        }
+
+
+def resample_path(path, period, output_dir=None, suffix=''):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    directory = output_dir if output_dir is not None else os.path.dirname(path)
+    return os.path.join(directory, f"{stem}{suffix}_per_{period}.csv")
+
+
+def output_suffixes(paths, output_dir=None):
+    # Logs sharing a name (e.g. a/sensor_data.csv and b/sensor_data.csv with
+    # --output-dir) get their position on the command line appended
+    def key(path, suffix=''):
+        return os.path.normcase(os.path.abspath(resample_path(path, 'minute', output_dir, suffix)))
+
+    counts = Counter(key(path) for path in paths)
+    suffixes = [f"_{i}" if counts[key(path)] > 1 else '' for i, path in enumerate(paths, 1)]
+    if len({key(path, suffix) for path, suffix in zip(paths, suffixes)}) < len(paths):
+        raise ValueError("resampled outputs of different logs would overwrite each other")
+    return suffixes
+
+
+def analyze_file(path, chunk_size=100000, interval=1.0, gap_factor=1.5, periods=('minute', 'hour'),
+                 output_dir=None, suffix=''):
+    outputs = {period: resample_path(path, period, output_dir, suffix) for period in periods}
+    files = {}
+    try:
+        writers = {}
+        for period, output in outputs.items():
+            files[period] = open(output, 'w', newline='', encoding='utf-8')
+            writers[period] = csv.writer(files[period])
+            writers[period].writerow(["Start"] + [f"{name}_{field}" for name in CHANNELS
+                                                  for field in ('count', 'mean', 'min', 'max')])
+
+        def write_bucket(period, row):
+            writers[period].writerow([row['start']] + [
+                "" if row[name][field] is None else row[name][field]
+                for name in CHANNELS for field in ('count', 'mean', 'min', 'max')])
+
+        analyzer = LogAnalyzer(interval=interval, gap_factor=gap_factor, periods=periods,
+                               on_bucket=write_bucket)
+        for values, times in read_chunks(path, chunk_size):
+            analyzer.update(values, times)
+        report = analyzer.result()
+    finally:
+        for file in files.values():
+            file.close()
+
+    report['file'] = path
+    report['resampled'] = {period: {'file': outputs[period], 'rows': count}
+                           for period, count in report['resampled'].items()}
+    return report
+
+
+def format_value(value, digits=1):
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def print_report(report):
+    print(f"== {report['file']} ({report['rows']} rows) ==")
+    if report['out_of_order']:
+        print(f"Skipped {report['out_of_order']} out-of-order readings")
+    print(f"{'Channel':<12}{'Count':>8}{'Missing':>9}{'Mean':>10}{'Std':>10}{'Min':>10}{'Max':>10}")
+    for name, stats in report['summary'].items():
+        print(f"{name:<12}{stats['count']:>8}{stats['missing']:>9}"
+              f"{format_value(stats['mean'], 2):>10}{format_value(stats['std'], 2):>10}"
+              f"{format_value(stats['min']):>10}{format_value(stats['max']):>10}")
+
+    print("CO2 bands:")
+    for name, band in report['co2_bands'].items():
+        print(f"  {name:<10}{band['seconds']:>10.0f} s  {band['episodes']:>5} episodes  "
+              f"longest {band['longest_seconds']:.0f} s")
+
+    gaps = report['gaps']
+    print(f"Gaps: {gaps['count']}" + (f" (total {gaps['seconds']:.0f} s, "
+                                      f"longest {gaps['longest_seconds']:.0f} s)" if gaps['count'] else ""))
+    for gap in gaps['first']:
+        print(f"  {gap['start']:.0f} -> {gap['end']:.0f} ({gap['seconds']:.0f} s)")
+    if gaps['count'] > len(gaps['first']):
+        print(f"  ... {gaps['count'] - len(gaps['first'])} more")
+
+    for period, output in report['resampled'].items():
+        print(f"Per {period}: {output['rows']} rows written to {output['file']}")
+    print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline analysis of recorded sensor logs")
+    parser.add_argument('files', nargs='+', help="CSV logs exported by the monitoring app")
+    parser.add_argument('--chunk-size', type=int, default=100000, help="Rows read per chunk")
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help="Seconds between samples (used when there is no Timestamp column)")
+    parser.add_argument('--gap-factor', type=float, default=1.5,
+                        help="Report a gap when readings are further apart than this many intervals")
+    parser.add_argument('--period', choices=sorted(PERIODS), action='append',
+                        help="Resampling period (default: minute and hour)")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="Worker processes for multiple files (default: CPU count)")
+    parser.add_argument('--output-dir', default=None,
+                        help="Directory for resampled CSVs (default: next to each log)")
+    parser.add_argument('--json', action='store_true', help="Print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    if (args.chunk_size < 1 or args.interval <= 0 or args.gap_factor <= 0
+            or (args.jobs is not None and args.jobs < 1)):
+        parser.error("--chunk-size, --interval, --gap-factor and --jobs must be positive")
+
+    analyze = partial(analyze_file, chunk_size=args.chunk_size, interval=args.interval,
+                      gap_factor=args.gap_factor, periods=tuple(args.period or ('minute', 'hour')),
+                      output_dir=args.output_dir)
+    try:
+        suffixes = output_suffixes(args.files, args.output_dir)
+    except ValueError as e:
+        parser.error(str(e))
+    reports = []
+    failed = 0
+
+    def collect(run):
+        # One bad file must not discard the reports of the others
+        nonlocal failed
+        try:
+            reports.append(run())
+        except (OSError, ValueError) as e:
+            failed += 1
+            print(f"Analysis error: {e}", file=sys.stderr)
+
+    if len(args.files) > 1 and args.jobs != 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            futures = [executor.submit(analyze, path, suffix=suffix)
+                       for path, suffix in zip(args.files, suffixes)]
+            for future in futures:
+                collect(future.result)
+    else:
+        for path, suffix in zip(args.files, suffixes):
+            collect(partial(analyze, path, suffix=suffix))
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for report in reports:
+            print_report(report)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+# CO2 bands shared by CO2Widget and the offline analysis (ppm).
+# Kept free of third-party imports so either side can use it on its own.
+CO2_EXCELLENT_MAX = 800
+CO2_GOOD_MAX = 1200
+CO2_BANDS = ["Excellent", "Good", "Poor"]
@@ -5,6 +5,7 @@ import subprocess
 import serial
 import serial.tools.list_ports
 import threading
+import time
 import pyqtgraph as pg
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
@@ -13,6 +14,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import pyqtSignal, QObject, Qt, QRectF
 from PyQt5.QtGui import QPainter, QColor, QFont, QLinearGradient, QPen, QPainterPath
+from co2_bands import CO2_EXCELLENT_MAX, CO2_GOOD_MAX
 
 # Color palette
 COLORS = {
@@ -184,10 +186,10 @@ class CO2Widget(QWidget):
         height = self.height()
         
         # Determine color and status based on CO2 level
-        if self.co2 < 800:
+        if self.co2 < CO2_EXCELLENT_MAX:
             color = QColor('#00b894')
             status = "Excellent"
-        elif self.co2 < 1200:
+        elif self.co2 < CO2_GOOD_MAX:
             color = QColor('#fdcb6e')
             status = "Good"
         else:
@@ -218,8 +220,70 @@ class CO2Widget(QWidget):
         painter.setFont(font)
         painter.drawText(width//2 - 30, height//2 + 30, status)
 
+class PortMonitor(QObject):
+    ports_changed = pyqtSignal(list)
+    ports_scanned = pyqtSignal(list)
+    port_added = pyqtSignal(str)
+    port_removed = pyqtSignal(str)
+
+    def __init__(self, interval=2.0):
+        super().__init__()
+        self.interval = interval  # Seconds between background scans
+        self.ports = []  # Cached device list from the last scan
+        self.scanned = False
+        self.scan_failed = False
+        self.running = False
+        self.thread = None
+        self.wake = threading.Event()
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.poll_ports, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.wake.set()
+        if self.thread:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def request_scan(self):
+        # Wake the worker early instead of enumerating on the caller's thread
+        self.wake.set()
+
+    def poll_ports(self):
+        while self.running:
+            try:
+                current = sorted(port.device for port in serial.tools.list_ports.comports())
+                self.scan_failed = False
+            except Exception as e:
+                # Report once until enumeration works again
+                if not self.scan_failed:
+                    print(f"Error listing ports: {e}")
+                self.scan_failed = True
+                current = self.ports
+
+            if current != self.ports or not self.scanned:
+                previous = set(self.ports)
+                self.ports = current
+                # Ports present at the first scan are not hot-plug events
+                if self.scanned:
+                    for device in current:
+                        if device not in previous:
+                            self.port_added.emit(device)
+                    for device in previous - set(current):
+                        self.port_removed.emit(device)
+                self.scanned = True
+                self.ports_changed.emit(list(current))
+            self.ports_scanned.emit(list(current))
+
+            self.wake.wait(self.interval)
+            self.wake.clear()
+
 class DataReceiver(QObject):
     data_received = pyqtSignal(str)
+    serial_reconnected = pyqtSignal(str)
 
     def __init__(self):
         super().__init__()
@@ -227,19 +291,29 @@ class DataReceiver(QObject):
         self.thread = None
         self.process = None
         self.serial_port = None
+        self.serial_config = None  # (port, baudrate) of the current serial session
+        self.dropped_serial = None  # (port, baudrate) of a session lost to unplugging
+        # Guards running/dropped_serial so a drop racing with stop() cannot revive a session
+        self.lock = threading.Lock()
 
     def start_simulator(self):
-        self.running = True
+        with self.lock:
+            self.running = True
+            self.serial_config = None
         self.thread = threading.Thread(target=self.read_from_simulator)
         self.thread.start()
 
-    def start_serial(self, port, baudrate=9600):
-        self.running = True
-        self.thread = threading.Thread(target=self.read_from_serial, args=(port, baudrate))
+    def start_serial(self, port, baudrate=9600, reconnect=False):
+        with self.lock:
+            self.running = True
+            self.serial_config = (port, baudrate)
+        self.thread = threading.Thread(target=self.read_from_serial, args=(port, baudrate, reconnect))
         self.thread.start()
 
     def stop(self):
-            self.running = False
+            with self.lock:
+                self.running = False
+                self.dropped_serial = None
             if self.process:
                 self.process.terminate()
                 self.process.wait()
@@ -268,16 +342,33 @@ class DataReceiver(QObject):
         except Exception as e:
             self.data_received.emit(f"Error running simulator: {e}")
 
-    def read_from_serial(self, port, baudrate):
+    def read_from_serial(self, port, baudrate, reconnect=False):
         try:
             self.serial_port = serial.Serial(port, baudrate, timeout=1)
+        except (serial.SerialException, OSError) as e:
+            if reconnect:
+                # Device not ready yet after re-enumeration; keep retrying
+                self.mark_dropped(port)
+            self.data_received.emit(f"Serial port error: {e}")
+            return
+
+        if reconnect:
+            self.serial_reconnected.emit(port)
+        try:
             while self.running:
                 line = self.serial_port.readline().decode('utf-8').strip()
                 if line:
                     self.data_received.emit(line)
-        except serial.SerialException as e:
+        except (serial.SerialException, OSError) as e:
+            # Device went away while monitoring; remember it for auto-reconnect
+            self.mark_dropped(port)
             self.data_received.emit(f"Serial port error: {e}")
 
+    def mark_dropped(self, port):
+        with self.lock:
+            if self.running and self.serial_config and self.serial_config[0] == port:
+                self.dropped_serial = self.serial_config
+
 class MonitoringApp(QWidget):
     def __init__(self):
         super().__init__()
@@ -287,8 +378,17 @@ class MonitoringApp(QWidget):
         self.receiver.data_received.connect(self.update_display)
         self.receiver.data_received.connect(self.update_graphs)
         self.receiver.data_received.connect(self.update_widgets)
+        self.receiver.serial_reconnected.connect(self.handle_reconnected)
+        self.reconnect_attempts = 0
+        self.next_reconnect = 0.0
+        self.port_monitor = PortMonitor()
+        self.port_monitor.ports_changed.connect(self.populate_com_ports)
+        self.port_monitor.ports_scanned.connect(self.retry_reconnect)
+        self.port_monitor.port_added.connect(self.handle_port_added)
+        self.port_monitor.port_removed.connect(self.handle_port_removed)
         self.data = []
         self.init_ui()
+        self.port_monitor.start()
         self.setStyleSheet(f"""
             QWidget {{
                 background-color: {COLORS['background']};
@@ -505,10 +605,42 @@ class MonitoringApp(QWidget):
             self.baud_layout.parentWidget().setVisible(False)  # Hide baud rate
 
     def update_com_ports(self):
+        # Show the cached list right away; the background scan fills in changes
+        self.populate_com_ports(self.port_monitor.ports)
+        self.port_monitor.request_scan()
+
+    def populate_com_ports(self, ports):
+        selected = self.com_selector.currentText()
+        self.com_selector.blockSignals(True)
         self.com_selector.clear()
-        ports = serial.tools.list_ports.comports()
-        for port in ports:
-            self.com_selector.addItem(port.device)
+        self.com_selector.addItems(ports)
+        if selected in ports:
+            self.com_selector.setCurrentText(selected)
+        self.com_selector.blockSignals(False)
+
+    def handle_port_added(self, port):
+        self.display.append(f"Port connected: {port}")
+
+    def retry_reconnect(self, ports):
+        # Runs after every scan, so a quick replug or a failed reopen is retried too
+        dropped = self.receiver.dropped_serial
+        if not dropped or dropped[0] not in ports or time.monotonic() < self.next_reconnect:
+            return
+        self.reconnect_attempts += 1
+        self.next_reconnect = time.monotonic() + min(2 ** self.reconnect_attempts, 30)
+        self.display.append(f"Reconnecting to {dropped[0]} (attempt {self.reconnect_attempts})")
+        self.receiver.stop()
+        self.receiver.start_serial(port=dropped[0], baudrate=dropped[1], reconnect=True)
+
+    def handle_reconnected(self, port):
+        self.reconnect_attempts = 0
+        self.next_reconnect = 0.0
+        self.display.append(f"Reconnected to {port}")
+
+    def handle_port_removed(self, port):
+        self.display.append(f"Port disconnected: {port}")
+        # Not every driver makes readline() fail on unplug
+        self.receiver.mark_dropped(port)
 
     def start_data_acquisition(self):
         self.stop_data_acquisition()
@@ -536,6 +668,8 @@ class MonitoringApp(QWidget):
 
     def stop_data_acquisition(self):
         self.receiver.stop()
+        self.reconnect_attempts = 0
+        self.next_reconnect = 0.0
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         self.display.append("Monitoring stopped.")
@@ -674,6 +808,7 @@ class MonitoringApp(QWidget):
     def closeEvent(self, event):
         self.save_data()
         self.receiver.stop()
+        self.port_monitor.stop()
         event.accept()
 
 if __name__ == "__main__":
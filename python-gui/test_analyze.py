@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from analyze import analyze_file, co2_band
+from co2_bands import CO2_BANDS
+
+
+def write_log(path, rows, timestamped=True):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write("Timestamp,Temperature,Humidity,CO2\n" if timestamped else "Temperature,Humidity,CO2\n")
+        for row in rows:
+            file.write(row + "\n")
+    return str(path)
+
+
+def random_log(tmp_path, n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    times = np.cumsum(rng.choice([1, 1, 1, 1, 0, 45], size=n))
+    temperature = rng.integers(-25, 55, size=n)
+    humidity = rng.integers(0, 100, size=n)
+    co2 = rng.choice([500, 700, 900, 1100, 1500], size=n)
+    rows = [f"{t},{a},{b},{c}" for t, a, b, c in zip(times, temperature, humidity, co2)]
+    return write_log(tmp_path / "log.csv", rows), times.astype(float), co2.astype(float)
+
+
+def test_chunk_size_does_not_change_result(tmp_path):
+    path, _, _ = random_log(tmp_path)
+    # Sprinkle in the corruption the reader has to tolerate
+    lines = open(path).read().splitlines()
+    lines[100] = lines[100].rsplit(',', 1)[0]
+    lines[200] = ""
+    lines[300] = "1,x,2,3"
+    lines.insert(400, "0,1,1,1")
+    with open(path, 'w') as file:
+        file.write("\n".join(lines) + "\n")
+
+    small_dir, large_dir = tmp_path / "small", tmp_path / "large"
+    small_dir.mkdir()
+    large_dir.mkdir()
+    small = analyze_file(path, chunk_size=1, output_dir=str(small_dir))
+    large = analyze_file(path, chunk_size=100000, output_dir=str(large_dir))
+
+    for name, stats in small.pop('summary').items():
+        assert stats == pytest.approx(large['summary'][name])
+    large.pop('summary')
+    for period in ('minute', 'hour'):
+        small_rows = np.loadtxt(small['resampled'][period].pop('file'), delimiter=',', skiprows=1, ndmin=2)
+        large_rows = np.loadtxt(large['resampled'][period].pop('file'), delimiter=',', skiprows=1, ndmin=2)
+        np.testing.assert_allclose(small_rows, large_rows)
+    assert small == large
+
+
+def test_bands_and_gaps_match_brute_force(tmp_path):
+    path, times, co2 = random_log(tmp_path, seed=1)
+    report = analyze_file(path, chunk_size=97, output_dir=str(tmp_path))
+
+    # Each reading holds until the next one, or one interval across a gap
+    step = np.diff(times)
+    gap = step > 1.5
+    durations = np.append(np.where(gap, 1.0, step), 1.0)
+    expected = np.bincount(co2_band(co2), weights=durations, minlength=len(CO2_BANDS))
+
+    for i, name in enumerate(CO2_BANDS):
+        assert report['co2_bands'][name]['seconds'] == pytest.approx(expected[i])
+    assert report['gaps']['count'] == gap.sum()
+    assert report['gaps']['seconds'] == pytest.approx(step[gap].sum())
+    assert report['summary']['CO2']['mean'] == pytest.approx(co2.mean())
+    assert report['summary']['CO2']['std'] == pytest.approx(co2.std(ddof=1))
+
+
+def test_out_of_order_readings_are_dropped(tmp_path):
+    path = write_log(tmp_path / "log.csv", ["10,1,1,500", "5,1,1,500", "6,1,1,500", "11,1,1,900"])
+    report = analyze_file(path, chunk_size=2, output_dir=str(tmp_path))
+
+    assert report['rows'] == 4
+    assert report['out_of_order'] == 2
+    assert report['summary']['CO2']['count'] == 2
+    assert report['co2_bands']['Excellent']['seconds'] == 1.0
+    assert report['co2_bands']['Good']['seconds'] == 1.0
+
+
+def test_blank_and_truncated_lines(tmp_path):
+    path = write_log(tmp_path / "log.csv", ["20,50,900", "", "20,50", "21,51,901", ""], timestamped=False)
+    report = analyze_file(path, output_dir=str(tmp_path))
+
+    # Blank lines are skipped; the truncated line is a missing CO2 reading
+    assert report['rows'] == 3
+    assert report['summary']['CO2']['missing'] == 1
+    assert report['summary']['Temperature']['missing'] == 0
+    assert report['gaps']['count'] == 1
+
+
+def test_iso_timestamps(tmp_path):
+    path = write_log(tmp_path / "log.csv", ["2025-01-01T00:00:00,1,1,500", "2025-01-01T00:00:01Z,1,1,500"])
+    report = analyze_file(path, output_dir=str(tmp_path))
+
+    assert report['co2_bands']['Excellent']['seconds'] == 2.0
+    assert report['gaps']['count'] == 0
+
+
+def test_unreadable_timestamps_are_rejected(tmp_path):
+    path = write_log(tmp_path / "log.csv", ["yesterday,1,1,500"])
+    with pytest.raises(ValueError, match="Timestamp"):
+        analyze_file(path, output_dir=str(tmp_path))